@@ -3,11 +3,16 @@ Analyzer management endpoints.
 
 API routes for triggering query analysis and managing the analyzer service.
 """
+import time
+
+import orjson
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
 
 from backend.core.logger import get_logger
 from backend.services.analyzer import QueryAnalyzer
+from backend.services.ai_stub import get_ai_analyzer
 
 logger = get_logger(__name__)
 
@@ -48,6 +53,45 @@ async def analyze_pending_queries(
     }
 
 
+# Declared before /analyze/{query_id} so "stream" isn't taken for a query ID
+@router.post("/analyze/stream", summary="Analyze pending queries, streaming results")
+def analyze_pending_queries_stream(limit: int = 50) -> StreamingResponse:
+    """
+    Analyze pending (NEW) slow queries and stream results as NDJSON.
+
+    One JSON line is sent per query as soon as its analysis completes,
+    followed by a summary line, so clients see progress without waiting
+    for the whole batch.
+
+    Args:
+        limit: Maximum number of queries to analyze in one batch (default: 50)
+    """
+    def generate():
+        start = time.perf_counter()
+        total = 0
+        analyzed = 0
+        logger.info(f"Streaming analysis triggered via API (limit={limit})")
+
+        for query_id, result_id in QueryAnalyzer().iter_analyze_pending(limit=limit):
+            total += 1
+            if result_id:
+                analyzed += 1
+            yield orjson.dumps({
+                "query_id": query_id,
+                "analysis_id": result_id,
+                "status": "ANALYZED" if result_id else "ERROR"
+            }) + b"\n"
+
+        yield orjson.dumps({
+            "summary": True,
+            "total": total,
+            "analyzed": analyzed,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+        }) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
 @router.post("/analyze/{query_id}", summary="Analyze specific query")
 async def analyze_query(
     query_id: str,
@@ -84,7 +128,7 @@ async def analyze_query(
 
 
 @router.get("/status", summary="Get analyzer status")
-async def get_analyzer_status() -> Dict[str, Any]:
+def get_analyzer_status() -> Dict[str, Any]:
     """
     Get the status of the analyzer service.
 
@@ -96,33 +140,26 @@ async def get_analyzer_status() -> Dict[str, Any]:
         from sqlalchemy import func
 
         with get_db_context() as db:
-            # Count queries by status
-            pending_count = db.query(func.count(SlowQueryRaw.id)).filter(
-                SlowQueryRaw.status == 'NEW'
-            ).scalar()
-
-            analyzed_count = db.query(func.count(SlowQueryRaw.id)).filter(
-                SlowQueryRaw.status == 'ANALYZED'
-            ).scalar()
-
-            error_count = db.query(func.count(SlowQueryRaw.id)).filter(
-                SlowQueryRaw.status == 'ERROR'
-            ).scalar()
-
-            # Analysis statistics
-            total_analyses = db.query(func.count(AnalysisResult.id)).scalar()
-
-            high_impact = db.query(func.count(AnalysisResult.id)).filter(
-                AnalysisResult.improvement_level == 'HIGH'
-            ).scalar()
-
-            medium_impact = db.query(func.count(AnalysisResult.id)).filter(
-                AnalysisResult.improvement_level == 'MEDIUM'
-            ).scalar()
-
-            low_impact = db.query(func.count(AnalysisResult.id)).filter(
-                AnalysisResult.improvement_level == 'LOW'
-            ).scalar()
+            # Count queries by status in a single grouped pass
+            status_counts = dict(
+                db.query(SlowQueryRaw.status, func.count(SlowQueryRaw.id))
+                .group_by(SlowQueryRaw.status)
+                .all()
+            )
+            pending_count = status_counts.get('NEW', 0)
+            analyzed_count = status_counts.get('ANALYZED', 0)
+            error_count = status_counts.get('ERROR', 0)
+
+            # Analysis statistics, also a single grouped pass
+            level_counts = dict(
+                db.query(AnalysisResult.improvement_level, func.count(AnalysisResult.id))
+                .group_by(AnalysisResult.improvement_level)
+                .all()
+            )
+            total_analyses = sum(level_counts.values())
+            high_impact = level_counts.get('HIGH', 0)
+            medium_impact = level_counts.get('MEDIUM', 0)
+            low_impact = level_counts.get('LOW', 0)
 
             return {
                 "queries": {
@@ -140,7 +177,8 @@ async def get_analyzer_status() -> Dict[str, Any]:
                 "analyzer": {
                     "version": "1.0.0",
                     "status": "ready"
-                }
+                },
+                "ai": get_ai_analyzer().get_stats()
             }
 
     except Exception as e:
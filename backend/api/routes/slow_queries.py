@@ -3,17 +3,22 @@ API routes for slow query management.
 
 Provides endpoints to list, retrieve, and manage slow queries.
 """
-from typing import List, Optional
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload, raiseload, selectinload
+from sqlalchemy import func, desc, tuple_
+from sqlalchemy.dialects.postgresql import aggregate_order_by
 
+from backend.core.config import settings
 from backend.db.session import get_db
 from backend.db.models import SlowQueryRaw, AnalysisResult
 from backend.api.schemas.slow_query import (
-    SlowQuerySummary,
+    DatabaseType,
+    QueryStatus,
     SlowQueryWithAnalysis,
     SlowQueryListResponse,
     ErrorResponse,
@@ -24,6 +29,48 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/slow-queries", tags=["Slow Queries"])
 
+# Handlers are plain functions: they run blocking SQLAlchemy queries, which
+# FastAPI executes in its threadpool instead of on the event loop
+
+
+def _strict(*options):
+    """
+    Add raiseload('*') to loader options when running in debug mode.
+
+    Any relationship that isn't eager-loaded explicitly then raises instead
+    of silently issuing one lazy SELECT per row, so N+1 regressions show up
+    during development. Production keeps the plain options.
+
+    Args:
+        options: Loader options for the query (joinedload, selectinload, ...)
+
+    Returns:
+        List of loader options to pass to Query.options()
+    """
+    if settings.debug:
+        return [*options, raiseload('*')]
+    return list(options)
+
+
+def _encode_cursor(query: SlowQueryRaw) -> str:
+    """Build the opaque keyset cursor pointing just after the given row."""
+    key = f"{query.captured_at.isoformat()}|{query.id}"
+    return base64.urlsafe_b64encode(key.encode('utf-8')).decode('ascii')
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """
+    Parse a cursor produced by _encode_cursor().
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    try:
+        captured_at, query_id = base64.urlsafe_b64decode(cursor).decode('utf-8').split('|')
+        return datetime.fromisoformat(captured_at), UUID(query_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {cursor}")
+
 
 @router.get(
     "",
@@ -31,13 +78,13 @@ router = APIRouter(prefix="/slow-queries", tags=["Slow Queries"])
     summary="List slow queries",
     description="Retrieve a paginated list of slow queries grouped by fingerprint"
 )
-async def list_slow_queries(
+def list_slow_queries(
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(50, ge=1, le=200, description="Items per page"),
-    source_db_type: Optional[str] = Query(None, description="Filter by database type"),
+    source_db_type: Optional[DatabaseType] = Query(None, description="Filter by database type"),
     source_db_host: Optional[str] = Query(None, description="Filter by database host"),
     min_duration_ms: Optional[float] = Query(None, description="Minimum query duration in milliseconds"),
-    status: Optional[str] = Query(None, description="Filter by status: NEW, ANALYZED, IGNORED, ERROR"),
+    status: Optional[QueryStatus] = Query(None, description="Filter by status: NEW, ANALYZED, IGNORED, ERROR"),
     db: Session = Depends(get_db)
 ):
     """
@@ -49,9 +96,6 @@ async def list_slow_queries(
     - Analysis status
     """
     try:
-        # Subquery to get the most recent query ID for each fingerprint group
-        from sqlalchemy import lateral
-
         # Build base query using the query_performance_summary view
         query = db.query(
             SlowQueryRaw.fingerprint,
@@ -64,14 +108,19 @@ async def list_slow_queries(
             func.percentile_cont(0.95).within_group(SlowQueryRaw.duration_ms).label('p95_duration_ms'),
             func.max(SlowQueryRaw.captured_at).label('last_seen'),
             func.bool_or(SlowQueryRaw.status == 'ANALYZED').label('has_analysis'),
-            func.max(AnalysisResult.improvement_level).label('max_improvement_level')
+            func.max(AnalysisResult.improvement_level).label('max_improvement_level'),
+            # Most recent query ID of each group, computed in the same pass
+            # instead of one extra query per row
+            func.array_agg(
+                aggregate_order_by(SlowQueryRaw.id, desc(SlowQueryRaw.captured_at))
+            )[1].label('representative_id')
         ).outerjoin(
             AnalysisResult, SlowQueryRaw.id == AnalysisResult.slow_query_id
         )
 
         # Apply filters
         if source_db_type:
-            query = query.filter(SlowQueryRaw.source_db_type == source_db_type)
+            query = query.filter(SlowQueryRaw.source_db_type == source_db_type.value)
 
         if source_db_host:
             query = query.filter(SlowQueryRaw.source_db_host == source_db_host)
@@ -80,7 +129,7 @@ async def list_slow_queries(
             query = query.having(func.avg(SlowQueryRaw.duration_ms) >= min_duration_ms)
 
         if status:
-            query = query.filter(SlowQueryRaw.status == status)
+            query = query.filter(SlowQueryRaw.status == status.value)
 
         # Group by fingerprint and source
         query = query.group_by(
@@ -96,19 +145,12 @@ async def list_slow_queries(
         offset = (page - 1) * page_size
         items = query.order_by(desc('avg_duration_ms')).offset(offset).limit(page_size).all()
 
-        # Convert to response model
-        # For each grouped result, get the most recent query ID
+        # Plain dicts: response_model validates the whole page once, so
+        # building SlowQuerySummary models here would validate every row twice
         summaries = []
         for item in items:
-            # Get the most recent query ID for this fingerprint group
-            representative_query = db.query(SlowQueryRaw.id).filter(
-                SlowQueryRaw.fingerprint == item.fingerprint,
-                SlowQueryRaw.source_db_type == item.source_db_type,
-                SlowQueryRaw.source_db_host == item.source_db_host
-            ).order_by(desc(SlowQueryRaw.captured_at)).first()
-
-            summaries.append(SlowQuerySummary(
-                id=str(representative_query.id) if representative_query else "",
+            summaries.append(dict(
+                id=str(item.representative_id) if item.representative_id else "",
                 fingerprint=item.fingerprint,
                 source_db_type=item.source_db_type,
                 source_db_host=item.source_db_host,
@@ -124,13 +166,13 @@ async def list_slow_queries(
 
         total_pages = (total + page_size - 1) // page_size
 
-        return SlowQueryListResponse(
-            items=summaries,
-            total=total,
-            page=page,
-            page_size=page_size,
-            total_pages=total_pages
-        )
+        return {
+            "items": summaries,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": total_pages
+        }
 
     except Exception as e:
         logger.error(f"Error listing slow queries: {e}")
@@ -143,7 +185,7 @@ async def list_slow_queries(
     summary="Get slow query details",
     description="Retrieve detailed information about a specific slow query including analysis"
 )
-async def get_slow_query(
+def get_slow_query(
     query_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -158,16 +200,18 @@ async def get_slow_query(
     - Optimization suggestions
     """
     try:
-        # Query slow query with its analysis
-        slow_query = db.query(SlowQueryRaw).filter(
+        # Query slow query with its analysis (joined in, not lazy-loaded)
+        slow_query = db.query(SlowQueryRaw).options(
+            *_strict(joinedload(SlowQueryRaw.analysis))
+        ).filter(
             SlowQueryRaw.id == query_id
         ).first()
 
         if not slow_query:
             raise HTTPException(status_code=404, detail=f"Query with ID {query_id} not found")
 
-        # Convert to response model (relationships are loaded automatically)
-        return SlowQueryWithAnalysis.model_validate(slow_query)
+        # response_model validates the ORM row once (from_attributes)
+        return slow_query
 
     except HTTPException:
         raise
@@ -182,25 +226,46 @@ async def get_slow_query(
     summary="Get queries by fingerprint",
     description="Retrieve all executions of queries matching a specific fingerprint"
 )
-async def get_queries_by_fingerprint(
+def get_queries_by_fingerprint(
     fingerprint_hash: str,
+    response: Response,
     limit: int = Query(10, ge=1, le=100, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
     db: Session = Depends(get_db)
 ):
     """
     Get all executions of queries matching a fingerprint.
 
     Useful for analyzing how the same query pattern performs over time.
+    Results are newest first. When more may follow, the X-Next-Cursor
+    response header holds the cursor for the next page; keyset pagination
+    keeps every page cheap no matter how deep it is.
     """
     try:
-        queries = db.query(SlowQueryRaw).filter(
+        # Analyses for all rows are fetched in one extra query
+        query = db.query(SlowQueryRaw).options(
+            *_strict(selectinload(SlowQueryRaw.analysis))
+        ).filter(
             SlowQueryRaw.fingerprint == fingerprint_hash
-        ).order_by(desc(SlowQueryRaw.captured_at)).limit(limit).all()
+        )
 
-        if not queries:
+        if cursor:
+            query = query.filter(
+                tuple_(SlowQueryRaw.captured_at, SlowQueryRaw.id) < tuple_(*_decode_cursor(cursor))
+            )
+
+        queries = query.order_by(
+            desc(SlowQueryRaw.captured_at), desc(SlowQueryRaw.id)
+        ).limit(limit).all()
+
+        if not queries and not cursor:
             raise HTTPException(status_code=404, detail=f"No queries found with fingerprint: {fingerprint_hash}")
 
-        return [SlowQueryWithAnalysis.model_validate(q) for q in queries]
+        if len(queries) == limit:
+            response.headers["X-Next-Cursor"] = _encode_cursor(queries[-1])
+
+        # response_model validates the ORM rows once (from_attributes)
+        return queries
 
     except HTTPException:
         raise
@@ -214,7 +279,7 @@ async def get_queries_by_fingerprint(
     summary="Delete slow query",
     description="Delete a slow query record and its analysis"
 )
-async def delete_slow_query(
+def delete_slow_query(
     query_id: UUID,
     db: Session = Depends(get_db)
 ):
@@ -25,6 +25,9 @@ logger = get_logger(__name__)
 
 router = APIRouter(prefix="/stats", tags=["Statistics"])
 
+# Handlers are plain functions: they run blocking SQLAlchemy queries, which
+# FastAPI executes in its threadpool instead of on the event loop
+
 
 @router.get(
     "/top-tables",
@@ -32,7 +35,7 @@ router = APIRouter(prefix="/stats", tags=["Statistics"])
     summary="Get top impacted tables",
     description="Retrieve tables that appear most frequently in slow queries"
 )
-async def get_top_tables(
+def get_top_tables(
     limit: int = Query(10, ge=1, le=50, description="Number of tables to return"),
     source_db_type: str = Query(None, description="Filter by database type"),
     db: Session = Depends(get_db)
@@ -87,7 +90,7 @@ async def get_top_tables(
     summary="Get database statistics",
     description="Get statistics for a specific database"
 )
-async def get_database_stats(
+def get_database_stats(
     db_type: str,
     db_host: str,
     db: Session = Depends(get_db)
@@ -102,28 +105,21 @@ async def get_database_stats(
     - High-impact queries count
     """
     try:
-        # Get basic counts
-        total_count = db.query(func.count(SlowQueryRaw.id)).filter(
+        # Basic counts and average in a single scan of the database's rows
+        counts = db.query(
+            func.count(SlowQueryRaw.id).label('total'),
+            func.count(SlowQueryRaw.id).filter(SlowQueryRaw.status == 'ANALYZED').label('analyzed'),
+            func.count(SlowQueryRaw.id).filter(SlowQueryRaw.status == 'NEW').label('pending'),
+            func.avg(SlowQueryRaw.duration_ms).label('avg_duration')
+        ).filter(
             SlowQueryRaw.source_db_type == db_type,
             SlowQueryRaw.source_db_host == db_host
-        ).scalar() or 0
-
-        analyzed_count = db.query(func.count(SlowQueryRaw.id)).filter(
-            SlowQueryRaw.source_db_type == db_type,
-            SlowQueryRaw.source_db_host == db_host,
-            SlowQueryRaw.status == 'ANALYZED'
-        ).scalar() or 0
-
-        pending_count = db.query(func.count(SlowQueryRaw.id)).filter(
-            SlowQueryRaw.source_db_type == db_type,
-            SlowQueryRaw.source_db_host == db_host,
-            SlowQueryRaw.status == 'NEW'
-        ).scalar() or 0
+        ).one()
 
-        avg_duration = db.query(func.avg(SlowQueryRaw.duration_ms)).filter(
-            SlowQueryRaw.source_db_type == db_type,
-            SlowQueryRaw.source_db_host == db_host
-        ).scalar() or 0
+        total_count = counts.total or 0
+        analyzed_count = counts.analyzed or 0
+        pending_count = counts.pending or 0
+        avg_duration = counts.avg_duration or 0
 
         # Count high-impact queries
         high_impact_count = db.query(func.count(AnalysisResult.id)).join(
@@ -155,7 +151,7 @@ async def get_database_stats(
     summary="Get global statistics",
     description="Get overall statistics across all monitored databases"
 )
-async def get_global_stats(
+def get_global_stats(
     db: Session = Depends(get_db)
 ):
     """
@@ -169,23 +165,18 @@ async def get_global_stats(
     - Recent query trends
     """
     try:
-        # Total queries
-        total_queries = db.query(func.count(SlowQueryRaw.id)).scalar() or 0
-
-        # Analyzed queries
-        analyzed_count = db.query(func.count(SlowQueryRaw.id)).filter(
-            SlowQueryRaw.status == 'ANALYZED'
-        ).scalar() or 0
-
-        # Pending queries
-        pending_count = db.query(func.count(SlowQueryRaw.id)).filter(
-            SlowQueryRaw.status == 'NEW'
-        ).scalar() or 0
-
-        # Number of unique databases
-        databases_count = db.query(
-            func.count(func.distinct(SlowQueryRaw.source_db_host))
-        ).scalar() or 0
+        # Query totals and number of unique databases in a single scan
+        counts = db.query(
+            func.count(SlowQueryRaw.id).label('total'),
+            func.count(SlowQueryRaw.id).filter(SlowQueryRaw.status == 'ANALYZED').label('analyzed'),
+            func.count(SlowQueryRaw.id).filter(SlowQueryRaw.status == 'NEW').label('pending'),
+            func.count(func.distinct(SlowQueryRaw.source_db_host)).label('databases')
+        ).one()
+
+        total_queries = counts.total or 0
+        analyzed_count = counts.analyzed or 0
+        pending_count = counts.pending or 0
+        databases_count = counts.databases or 0
 
         # Top tables (limit to 5 for global view)
         top_tables_query = text("""
@@ -271,14 +262,14 @@ async def get_global_stats(
     summary="Get overall statistics",
     description="Get overall statistics across all monitored databases (frontend aggregate endpoint)"
 )
-async def get_stats(
+def get_stats(
     db: Session = Depends(get_db)
 ):
     """
     Aggregate statistics endpoint for frontend compatibility.
     Returns same data as /global for now.
     """
-    return await get_global_stats(db)
+    return get_global_stats(db)
 
 
 @router.get(
@@ -286,7 +277,7 @@ async def get_stats(
     summary="List monitored databases",
     description="Get list of all databases being monitored"
 )
-async def list_monitored_databases(
+def list_monitored_databases(
     db: Session = Depends(get_db)
 ):
     """
@@ -2,6 +2,8 @@
 Pydantic schemas for request/response validation.
 """
 from backend.api.schemas.slow_query import (
+    DatabaseType,
+    QueryStatus,
     SlowQuerySummary,
     SlowQueryDetail,
     SlowQueryWithAnalysis,
@@ -21,6 +23,8 @@ from backend.api.schemas.stats import (
 
 __all__ = [
     # Slow Query schemas
+    "DatabaseType",
+    "QueryStatus",
     "SlowQuerySummary",
     "SlowQueryDetail",
     "SlowQueryWithAnalysis",
@@ -7,10 +7,27 @@ from datetime import datetime
 from typing import Optional, List, Dict, Any
 from uuid import UUID
 from decimal import Decimal
+from enum import Enum
 
 from pydantic import BaseModel, Field, ConfigDict
 
 
+class DatabaseType(str, Enum):
+    """Source database types accepted as filters."""
+    MYSQL = "mysql"
+    POSTGRES = "postgres"
+    ORACLE = "oracle"
+    SQLSERVER = "sqlserver"
+
+
+class QueryStatus(str, Enum):
+    """Slow query processing status."""
+    NEW = "NEW"
+    ANALYZED = "ANALYZED"
+    IGNORED = "IGNORED"
+    ERROR = "ERROR"
+
+
 class SlowQueryBase(BaseModel):
     """Base schema for slow query data."""
     source_db_type: str = Field(..., description="Database type: mysql, postgres, oracle, sqlserver")
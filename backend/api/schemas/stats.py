@@ -2,7 +2,7 @@
 Pydantic schemas for statistics API responses.
 """
 from typing import List, Dict, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, ConfigDict
 
 
 class TableImpactSchema(BaseModel):
@@ -14,8 +14,7 @@ class TableImpactSchema(BaseModel):
     avg_duration_ms: float = Field(..., description="Average execution time for queries on this table")
     distinct_queries: int = Field(..., description="Number of distinct query patterns")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DatabaseStatsSchema(BaseModel):
@@ -54,8 +53,7 @@ class GlobalStatsResponse(BaseModel):
     improvement_summary: List[ImprovementSummarySchema]
     recent_trend: List[QueryTrendSchema]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class HealthCheckResponse(BaseModel):
@@ -67,5 +65,4 @@ class HealthCheckResponse(BaseModel):
     uptime_seconds: Optional[float] = None
     timestamp: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -3,18 +3,20 @@ Configuration management for AI Query Analyzer backend.
 
 Loads and validates configuration from environment variables.
 """
-import os
-from typing import Optional, Dict, Any
-from dataclasses import dataclass, field
+from typing import ClassVar, Optional, Dict, Any, List, Union
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 from backend.core.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-@dataclass
-class DatabaseConfig:
+class DatabaseConfig(BaseModel):
     """Configuration for a database connection."""
+    model_config = ConfigDict(frozen=True)
+
     host: str
     port: int
     user: str
@@ -41,73 +43,108 @@ class DatabaseConfig:
         }
 
 
-@dataclass
-class Settings:
+class InternalDatabaseSettings(BaseSettings, DatabaseConfig):
+    """Internal database (INTERNAL_DB_* variables)."""
+    model_config = SettingsConfigDict(env_prefix='INTERNAL_DB_')
+
+    host: str = 'localhost'
+    port: int = 5440
+    user: str = 'ai_core'
+    password: str = 'ai_core'
+    database: str = Field('ai_core', validation_alias='INTERNAL_DB_NAME')
+
+
+class MySQLLabSettings(BaseSettings, DatabaseConfig):
+    """Lab MySQL database (MYSQL_* variables)."""
+    model_config = SettingsConfigDict(env_prefix='MYSQL_')
+
+    host: str = '127.0.0.1'
+    port: int = 3307
+    user: str = 'root'
+    password: str = 'root'
+    database: str = Field('labdb', validation_alias='MYSQL_DB')
+
+
+class PostgresLabSettings(BaseSettings, DatabaseConfig):
+    """Lab PostgreSQL database (PG_* variables)."""
+    model_config = SettingsConfigDict(env_prefix='PG_')
+
+    host: str = '127.0.0.1'
+    port: int = 5433
+    user: str = 'postgres'
+    password: str = 'root'
+    database: str = Field('labdb', validation_alias='PG_DB')
+
+
+class Settings(BaseSettings):
     """
     Application settings loaded from environment variables.
 
     All database configurations and application settings are centralized here.
+    Fields are read from the environment variable of the same name
+    (case-insensitive) unless an alias says otherwise. Settings are
+    read-only once loaded; use reload_settings() to pick up changes.
     """
+    model_config = SettingsConfigDict(frozen=True)
 
     # Application settings
-    env: str = field(default_factory=lambda: os.getenv('ENV', 'development'))
-    log_level: str = field(default_factory=lambda: os.getenv('LOG_LEVEL', 'INFO'))
-    debug: bool = field(default_factory=lambda: os.getenv('DEBUG', 'false').lower() == 'true')
+    env: str = 'development'
+    log_level: str = 'INFO'
+    debug: bool = False
+    # Request paths not logged by the request logging middleware (polling endpoints)
+    log_skip_paths: Union[List[str], str] = Field(default_factory=lambda: ['/health'])
 
     # Internal database (PostgreSQL for storing collected queries and analysis)
-    internal_db: DatabaseConfig = field(default_factory=lambda: DatabaseConfig(
-        host=os.getenv('INTERNAL_DB_HOST', 'localhost'),
-        port=int(os.getenv('INTERNAL_DB_PORT', '5440')),
-        user=os.getenv('INTERNAL_DB_USER', 'ai_core'),
-        password=os.getenv('INTERNAL_DB_PASSWORD', 'ai_core'),
-        database=os.getenv('INTERNAL_DB_NAME', 'ai_core'),
-    ))
+    internal_db: DatabaseConfig = Field(default_factory=InternalDatabaseSettings)
 
     # Redis configuration
-    redis_host: str = field(default_factory=lambda: os.getenv('REDIS_HOST', 'localhost'))
-    redis_port: int = field(default_factory=lambda: int(os.getenv('REDIS_PORT', '6379')))
-    redis_db: int = field(default_factory=lambda: int(os.getenv('REDIS_DB', '0')))
+    redis_host: str = 'localhost'
+    redis_port: int = 6379
+    redis_db: int = 0
 
     # Lab MySQL database (target for slow query collection)
-    mysql_lab: DatabaseConfig = field(default_factory=lambda: DatabaseConfig(
-        host=os.getenv('MYSQL_HOST', '127.0.0.1'),
-        port=int(os.getenv('MYSQL_PORT', '3307')),
-        user=os.getenv('MYSQL_USER', 'root'),
-        password=os.getenv('MYSQL_PASSWORD', 'root'),
-        database=os.getenv('MYSQL_DB', 'labdb'),
-    ))
+    mysql_lab: DatabaseConfig = Field(default_factory=MySQLLabSettings)
 
     # Lab PostgreSQL database (target for slow query collection)
-    postgres_lab: DatabaseConfig = field(default_factory=lambda: DatabaseConfig(
-        host=os.getenv('PG_HOST', '127.0.0.1'),
-        port=int(os.getenv('PG_PORT', '5433')),
-        user=os.getenv('PG_USER', 'postgres'),
-        password=os.getenv('PG_PASSWORD', 'root'),
-        database=os.getenv('PG_DB', 'labdb'),
-    ))
+    postgres_lab: DatabaseConfig = Field(default_factory=PostgresLabSettings)
 
     # Collector settings
-    collector_interval_seconds: int = field(
-        default_factory=lambda: int(os.getenv('COLLECTOR_INTERVAL', '300'))
+    collector_interval_seconds: int = Field(
+        300, validation_alias='COLLECTOR_INTERVAL'
     )  # Run collector every 5 minutes by default
 
     # Analyzer settings
-    analyzer_interval_seconds: int = field(
-        default_factory=lambda: int(os.getenv('ANALYZER_INTERVAL', '600'))
+    analyzer_interval_seconds: int = Field(
+        600, validation_alias='ANALYZER_INTERVAL'
     )  # Run analyzer every 10 minutes by default
+    analyzer_concurrency: int = 4  # Pending queries analyzed in parallel (AI calls are I/O bound)
 
     # AI provider settings (abstract interface, no hardcoded provider)
-    ai_provider: str = field(default_factory=lambda: os.getenv('AI_PROVIDER', 'stub'))
-    ai_api_key: Optional[str] = field(default_factory=lambda: os.getenv('AI_API_KEY'))
-    ai_model: str = field(default_factory=lambda: os.getenv('AI_MODEL', 'gpt-4'))
-
-    # API settings
-    api_title: str = "AI Query Analyzer API"
-    api_version: str = "1.0.0"
-    api_description: str = "API for collecting, analyzing, and optimizing slow SQL queries"
-
-    def __post_init__(self):
-        """Validate configuration after initialization."""
+    ai_provider: str = 'stub'
+    ai_api_key: Optional[str] = None
+    # Extra keys; requests are spread round-robin across all configured keys.
+    # The str arm keeps pydantic-settings from JSON-decoding comma-separated values.
+    ai_api_keys: Union[List[str], str] = Field(default_factory=list)
+    ai_model: str = 'gpt-4'
+    ai_cache_enabled: bool = True
+    ai_cache_size: int = 1024  # Max cached AI responses (one per query fingerprint), 0 disables
+    ai_cache_ttl: int = 86400  # Seconds a cached AI response stays valid, 0 never expires
+
+    # API settings (constants, not read from the environment)
+    api_title: ClassVar[str] = "AI Query Analyzer API"
+    api_version: ClassVar[str] = "1.0.0"
+    api_description: ClassVar[str] = "API for collecting, analyzing, and optimizing slow SQL queries"
+
+    @field_validator('log_skip_paths', 'ai_api_keys', mode='before')
+    @classmethod
+    def _split_comma_list(cls, value: Any) -> Any:
+        """Accept list settings (LOG_SKIP_PATHS, AI_API_KEYS) as comma-separated strings."""
+        if isinstance(value, str):
+            return [k.strip() for k in value.split(',') if k.strip()]
+        return value
+
+    def model_post_init(self, __context: Any):
+        """Log configuration after initialization."""
         logger.info("Configuration loaded:")
         logger.info(f"  Environment: {self.env}")
         logger.info(f"  Log Level: {self.log_level}")
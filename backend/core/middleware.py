@@ -0,0 +1,85 @@
+"""
+ASGI middleware for the AI Query Analyzer backend.
+
+Written as plain ASGI callables rather than BaseHTTPMiddleware, which runs
+every request in an extra task and wraps the response body in a stream.
+"""
+import logging
+import time
+from typing import Iterable
+
+from starlette.middleware.gzip import GZipMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RequestLoggingMiddleware:
+    """
+    Log every HTTP request and its response status and duration.
+
+    Also reports the handler time in an X-Response-Time header. Requests to
+    skip_paths (health probes and other polling endpoints) are passed
+    straight through.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: Iterable[str] = ()):
+        self.app = app
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+
+        # Checked once per request; the log calls below are skipped entirely
+        # when INFO is disabled
+        log_enabled = logger.isEnabledFor(logging.INFO)
+        if log_enabled:
+            logger.info("→ %s %s", method, path)
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                duration_ms = (time.perf_counter() - start_time) * 1000
+                headers = list(message.get("headers", ()))
+                headers.append((b"x-response-time", f"{duration_ms:.2f}ms".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if log_enabled:
+                duration = time.perf_counter() - start_time
+                logger.info("← %s %s [%d] %.3fs", method, path, status_code, duration)
+
+
+class StreamingAwareGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that leaves streaming endpoints uncompressed.
+
+    GZip buffers compressed output until enough of it has accumulated, so
+    streamed lines (e.g. NDJSON progress) would reach the client in bursts
+    or only at the end. Requests to skip_paths are passed straight through.
+    """
+
+    def __init__(self, app: ASGIApp, skip_paths: Iterable[str] = (), **kwargs):
+        super().__init__(app, **kwargs)
+        self.skip_paths = frozenset(skip_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http" and scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        await super().__call__(scope, receive, send)
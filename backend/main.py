@@ -3,26 +3,30 @@ AI Query Analyzer - FastAPI Backend Application
 
 Main entry point for the FastAPI application.
 """
+import asyncio
 import time
 from contextlib import asynccontextmanager
 from datetime import datetime
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
 from backend.core.config import settings
 from backend.core.logger import get_logger
+from backend.core.middleware import RequestLoggingMiddleware, StreamingAwareGZipMiddleware
 from backend.db.session import check_db_connection, init_db
 from backend.api.routes import slow_queries, stats, collectors, analyzer
 from backend.services.scheduler import start_scheduler, stop_scheduler
+from backend.services.ai_stub import close_ai_analyzer
 
 logger = get_logger(__name__)
 
-# Application startup timestamp
-APP_START_TIME = time.time()
+# Application startup time on the monotonic clock (for uptime; immune to
+# wall-clock adjustments)
+APP_START_TIME = time.monotonic()
 
 
 @asynccontextmanager
@@ -37,6 +41,8 @@ async def lifespan(app: FastAPI):
     logger.info("AI Query Analyzer Backend Starting...")
     logger.info(f"Environment: {settings.env}")
     logger.info(f"Version: {app.version}")
+    loop = asyncio.get_running_loop()
+    logger.info(f"Event loop: {type(loop).__module__}.{type(loop).__name__}")
     logger.info("=" * 60)
 
     # Initialize database
@@ -85,6 +91,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}")
 
+    # Close AI provider connections
+    try:
+        close_ai_analyzer()
+    except Exception as e:
+        logger.error(f"Error closing AI provider connections: {e}")
+
+    # Close Redis connections
+    if _redis_client is not None:
+        try:
+            await _redis_client.aclose()
+        except Exception as e:
+            logger.error(f"Error closing Redis connections: {e}")
+
     # Close database connections
     try:
         from backend.db.session import close_db_connections
@@ -102,6 +121,7 @@ app = FastAPI(
     description=settings.api_description,
     version=settings.api_version,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,  # orjson serializes responses several times faster
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -121,36 +141,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # Keyset pagination cursor
 )
 
 
-# Request logging middleware
-@app.middleware("http")
-async def log_requests(request: Request, call_next):
-    """Log all HTTP requests."""
-    start_time = time.time()
-
-    # Log request
-    logger.info(f"→ {request.method} {request.url.path}")
-
-    # Process request
-    response = await call_next(request)
+# Compress larger responses (slow query lists, stats); small bodies aren't
+# worth the CPU. The NDJSON analysis stream is sent uncompressed so each
+# result line is delivered as soon as it is produced.
+app.add_middleware(
+    StreamingAwareGZipMiddleware,
+    minimum_size=1024,
+    compresslevel=5,
+    skip_paths=["/api/v1/analyzer/analyze/stream"],
+)
 
-    # Log response
-    duration = time.time() - start_time
-    logger.info(
-        f"← {request.method} {request.url.path} "
-        f"[{response.status_code}] {duration:.3f}s"
-    )
 
-    return response
+# Request logging middleware (pure ASGI, outermost so it times the whole stack)
+app.add_middleware(RequestLoggingMiddleware, skip_paths=settings.log_skip_paths)
 
 
 # Exception handlers
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={
             "error": exc.detail,
@@ -162,7 +176,7 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle request validation errors."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
         content={
             "error": "Validation error",
@@ -176,7 +190,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle uncaught exceptions."""
     logger.error(f"Unhandled exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -186,6 +200,97 @@ async def general_exception_handler(request: Request, exc: Exception):
     )
 
 
+# Health check response fields that don't change while the app runs; probes
+# hit /health every few seconds, so only the status fields are filled per call
+_HEALTH_TEMPLATE = {
+    "status": None,
+    "version": settings.api_version,
+    "environment": settings.env,
+    "database": None,
+    "redis": None,
+    "uptime_seconds": None,
+    "timestamp": None,
+}
+_HEALTH_DATABASE_INFO = {
+    "host": settings.internal_db.host,
+    "port": settings.internal_db.port,
+}
+_HEALTH_REDIS_INFO = {
+    "host": settings.redis_host,
+    "port": settings.redis_port,
+}
+
+# Async Redis client shared by health checks (created on first use)
+_redis_client = None
+
+
+def _get_redis_client():
+    """
+    Get the shared async Redis client, creating it on first use.
+
+    Reusing one client keeps its connection pool, so each health check
+    doesn't open a new TCP connection. Keepalive and the periodic health
+    check keep pooled connections from going stale between probes, and the
+    timeouts stop an unreachable Redis from stalling /health.
+
+    Returns:
+        redis.asyncio.Redis client instance
+    """
+    global _redis_client
+    if _redis_client is None:
+        import redis.asyncio as aioredis
+        _redis_client = aioredis.from_url(
+            settings.get_redis_url(),
+            max_connections=16,
+            health_check_interval=30,
+            socket_keepalive=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+            retry_on_timeout=True,
+        )
+    return _redis_client
+
+
+# Dependency probe results are reused for this many seconds, so bursts of
+# load balancer checks don't each open a DB session and ping Redis
+_HEALTH_PROBE_TTL = 2.0
+_health_probe_cache = None  # (expiry on the monotonic clock, (db_status, redis_status))
+
+
+async def _check_database() -> str:
+    """Probe the internal database (sync driver, so run it off the event loop)."""
+    return "healthy" if await asyncio.to_thread(check_db_connection) else "unhealthy"
+
+
+async def _check_redis() -> str:
+    """Ping Redis with the shared client."""
+    try:
+        await _get_redis_client().ping()
+        return "healthy"
+    except Exception as e:
+        logger.warning(f"Redis health check failed: {e}")
+        return "unhealthy"
+
+
+async def _probe_dependencies():
+    """
+    Check the database and Redis concurrently.
+
+    Results are cached for _HEALTH_PROBE_TTL seconds.
+
+    Returns:
+        Tuple of (db_status, redis_status)
+    """
+    global _health_probe_cache
+    now = time.monotonic()
+    if _health_probe_cache is not None and _health_probe_cache[0] > now:
+        return _health_probe_cache[1]
+
+    statuses = tuple(await asyncio.gather(_check_database(), _check_redis()))
+    _health_probe_cache = (time.monotonic() + _HEALTH_PROBE_TTL, statuses)
+    return statuses
+
+
 # Health check endpoint
 @app.get(
     "/health",
@@ -199,21 +304,9 @@ async def health_check():
 
     Returns the status of the application and its dependencies.
     """
-    uptime = time.time() - APP_START_TIME
+    uptime = time.monotonic() - APP_START_TIME
 
-    # Check database
-    db_status = "healthy" if check_db_connection() else "unhealthy"
-
-    # Check Redis (simple check)
-    redis_status = "unknown"
-    try:
-        import redis
-        r = redis.from_url(settings.get_redis_url())
-        r.ping()
-        redis_status = "healthy"
-    except Exception as e:
-        logger.warning(f"Redis health check failed: {e}")
-        redis_status = "unhealthy"
+    db_status, redis_status = await _probe_dependencies()
 
     # Determine overall status
     if db_status == "healthy" and redis_status == "healthy":
@@ -223,23 +316,13 @@ async def health_check():
     else:
         overall_status = "degraded"
 
-    return {
-        "status": overall_status,
-        "version": settings.api_version,
-        "environment": settings.env,
-        "database": {
-            "status": db_status,
-            "host": settings.internal_db.host,
-            "port": settings.internal_db.port,
-        },
-        "redis": {
-            "status": redis_status,
-            "host": settings.redis_host,
-            "port": settings.redis_port,
-        },
-        "uptime_seconds": round(uptime, 2),
-        "timestamp": datetime.utcnow().isoformat(),
-    }
+    health = dict(_HEALTH_TEMPLATE)
+    health["status"] = overall_status
+    health["database"] = {"status": db_status, **_HEALTH_DATABASE_INFO}
+    health["redis"] = {"status": redis_status, **_HEALTH_REDIS_INFO}
+    health["uptime_seconds"] = round(uptime, 2)
+    health["timestamp"] = datetime.utcnow().isoformat()
+    return health
 
 
 # Root endpoint
@@ -284,7 +367,8 @@ async def log_routes():
 
 if __name__ == "__main__":
     # This allows running the app directly with `python main.py`
-    # For production, use: uvicorn backend.main:app --host 0.0.0.0 --port 8000
+    # For production, use: uvicorn backend.main:app --host 0.0.0.0 --port 8000 \
+    #     --workers 4 --loop uvloop --http httptools --no-access-log
     import uvicorn
 
     uvicorn.run(
@@ -293,4 +377,6 @@ if __name__ == "__main__":
         port=8000,
         reload=True,  # Enable auto-reload in development
         log_level="info",
+        # The request logging middleware already logs every request
+        access_log=settings.env != "production",
     )
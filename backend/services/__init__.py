@@ -3,16 +3,36 @@ Business logic and service layer.
 
 Contains collectors, analyzers, and other domain services.
 """
-from backend.services.mysql_collector import MySQLCollector
-from backend.services.postgres_collector import PostgreSQLCollector
+import importlib
+
 from backend.services.fingerprint import (
     fingerprint_query,
     normalize_query,
     is_query_safe_to_explain,
     extract_tables_from_query,
 )
-from backend.services.analyzer import QueryAnalyzer
-from backend.services.ai_stub import AIAnalyzer, get_ai_analyzer
+
+# Collectors and analyzers pull in database drivers and provider SDKs, so
+# they are imported on first attribute access (PEP 562). Importing a light
+# module such as backend.services.fingerprint no longer loads all of them.
+_LAZY_ATTRS = {
+    "MySQLCollector": "backend.services.mysql_collector",
+    "PostgreSQLCollector": "backend.services.postgres_collector",
+    "QueryAnalyzer": "backend.services.analyzer",
+    "AIAnalyzer": "backend.services.ai_stub",
+    "get_ai_analyzer": "backend.services.ai_stub",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     "MySQLCollector",
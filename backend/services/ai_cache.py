@@ -0,0 +1,132 @@
+"""
+In-process cache for AI analysis results.
+
+Slow query workloads are highly repetitive: the same query pattern is
+collected again and again with different literal values. Keying AI
+responses on the normalized query fingerprint lets repeated patterns
+skip the LLM round-trip entirely.
+"""
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+from backend.services.fingerprint import normalize_query
+
+
+def make_cache_key(sql: str, db_type: str, model: str = '') -> str:
+    """
+    Build the cache key for a query.
+
+    Queries that only differ in literal values share the same
+    fingerprint, and therefore the same key. The model is part of the
+    key so switching AI_MODEL doesn't serve answers from the old model.
+
+    Args:
+        sql: SQL query text
+        db_type: Database type (mysql, postgres)
+        model: AI model producing the analysis
+
+    Returns:
+        Hex digest identifying the query pattern
+    """
+    fingerprint = normalize_query(sql)
+    return hashlib.sha256(f"{model}|{db_type}|{fingerprint}".encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    """
+    Thread-safe LRU cache of AI analysis results.
+
+    Entries are deep-copied on the way in and out so callers can freely
+    mutate the analysis they receive (enhance_analysis extends lists in place).
+    With a TTL, entries older than ttl seconds are treated as misses, so
+    analyses are eventually refreshed (e.g. after schema or index changes).
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """
+        Initialize cache.
+
+        Args:
+            maxsize: Maximum number of entries kept before evicting the
+                least recently used one
+            ttl: Seconds an entry stays valid, None or 0 for no expiry
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl or None
+        # key -> (expiry time on the monotonic clock or None, analysis)
+        self._entries: "OrderedDict[str, Tuple[Optional[float], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached analysis.
+
+        Args:
+            key: Cache key from make_cache_key()
+
+        Returns:
+            Copy of the cached analysis, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy.deepcopy(entry[1])
+
+    def set(self, key: str, value: Dict[str, Any]):
+        """
+        Store an analysis, evicting the oldest entries if the cache is full.
+
+        Args:
+            key: Cache key from make_cache_key()
+            value: Analysis result to cache
+        """
+        if self.maxsize <= 0:
+            return
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        entry = (expires_at, copy.deepcopy(value))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries and reset counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dictionary with size and hit/miss counters
+        """
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
@@ -4,13 +4,136 @@ AI-assisted query analysis stub.
 Placeholder for future LLM integration (OpenAI, Anthropic, etc.)
 for advanced query analysis and optimization suggestions.
 """
-import json
-from typing import Dict, Any, Optional
+import copy
+import itertools
+import threading
+import time
+from concurrent.futures import Future
+from functools import lru_cache
+from typing import Dict, Any, List, Optional
+
+import orjson
+
 from backend.core.config import settings
 from backend.core.logger import get_logger
+from backend.services.ai_cache import AnalysisCache, make_cache_key
+from backend.services.fingerprint import is_trivial_query
 
 logger = get_logger(__name__)
 
+# Connection pool limits for provider HTTP clients. One pool is shared by
+# all API keys, so consecutive analyses reuse warm keep-alive connections.
+_HTTP_MAX_CONNECTIONS = 32
+_HTTP_MAX_KEEPALIVE = 10
+
+# Display names used to specialize the system prompt
+_DB_ENGINE_NAMES = {
+    'mysql': 'MySQL',
+    'postgres': 'PostgreSQL',
+}
+
+_SYSTEM_PROMPT_TEMPLATE = """You are a senior database performance engineer with expertise in {engine} optimization.
+Analyze SQL queries and provide specific, actionable optimization recommendations.
+
+Response format (JSON):
+{{
+  "root_cause": "Specific technical reason for slow performance",
+  "problem_summary": "Brief description of the issue",
+  "index_recommendations": [
+    {{
+      "sql": "CREATE INDEX idx_name ON table(col1, col2)",
+      "rationale": "Why this index helps",
+      "impact": "Expected improvement"
+    }}
+  ],
+  "query_optimizations": [
+    {{
+      "type": "rewrite|structure|join",
+      "description": "What to change",
+      "example": "Improved query example if applicable"
+    }}
+  ],
+  "improvement_level": "LOW|MEDIUM|HIGH|CRITICAL",
+  "estimated_speedup": "e.g., 10-50x",
+  "confidence": 0.85
+}}"""
+
+# Per-query user message; filled with str.format in _build_openai_messages()
+_USER_PROMPT_TEMPLATE = """Analyze this slow query:
+
+DATABASE: {db_type}
+DURATION: {duration_ms}ms
+ROWS EXAMINED: {rows_examined}
+ROWS RETURNED: {rows_returned}
+EFFICIENCY RATIO: {ratio}
+
+SQL QUERY:
+```sql
+{sql}
+```
+
+EXECUTION PLAN:
+```json
+{plan}
+```
+
+Provide specific recommendations with exact column names for indexes."""
+
+
+# Plans serialized above this size are sent without indentation; for large
+# plans the whitespace alone adds kilobytes to every request
+_COMPACT_PLAN_BYTES = 4096
+
+
+def _format_rows(rows: Optional[int]) -> str:
+    """Format a row count with thousands separators, or N/A when unknown."""
+    return f"{rows:,}" if rows is not None else "N/A"
+
+
+@lru_cache(maxsize=16)
+def _system_prompt(db_type: str) -> str:
+    """
+    Get the OpenAI system prompt for a database type.
+
+    The prompt only depends on the database type, so it is built once per
+    type. It is also kept byte-identical across requests, with all
+    per-query content in the user message, so the provider can reuse its
+    prompt-prefix cache.
+
+    Args:
+        db_type: Database type (mysql, postgres)
+
+    Returns:
+        System prompt text
+    """
+    engine = _DB_ENGINE_NAMES.get(db_type, 'MySQL and PostgreSQL')
+    return _SYSTEM_PROMPT_TEMPLATE.format(engine=engine)
+
+
+def _strip_code_fence(content: str) -> str:
+    """
+    Remove a markdown code fence (```json ... ```) wrapping a model reply.
+
+    Models often fence their JSON output; detecting the fence up front lets
+    the reply be parsed once instead of failing and retrying.
+
+    Args:
+        content: Raw message content
+
+    Returns:
+        Content between the fences, or the original content if unfenced
+    """
+    stripped = content.strip()
+    if not stripped.startswith('```'):
+        return content
+
+    body_start = stripped.find('\n')
+    body_end = stripped.rfind('```')
+    if body_start == -1 or body_end <= body_start:
+        return content
+
+    return stripped[body_start + 1:body_end]
+
 
 class AIAnalyzer:
     """
@@ -32,12 +155,44 @@ class AIAnalyzer:
             api_key: API key for the provider
         """
         self.provider = provider
-        self.api_key = api_key or settings.ai_api_key
+
+        # AI_API_KEYS adds keys (e.g. separate projects or deployments) that
+        # requests rotate through, multiplying the provider rate limit
+        self.api_keys = list(dict.fromkeys(
+            key for key in [api_key or settings.ai_api_key, *settings.ai_api_keys] if key
+        ))
+        self.api_key = self.api_keys[0] if self.api_keys else None
 
         if self.provider != "stub" and not self.api_key:
             logger.warning(f"AI provider '{provider}' requires API key")
             self.provider = "stub"
 
+        # Responses are cached per query fingerprint, see ai_cache
+        self.cache = AnalysisCache(
+            maxsize=settings.ai_cache_size if settings.ai_cache_enabled else 0,
+            ttl=settings.ai_cache_ttl
+        )
+
+        # Provider calls currently running, by cache key. Concurrent requests
+        # for the same query wait on the first call instead of issuing their own.
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Provider call statistics (running mean, updated incrementally).
+        # Analyses run concurrently on worker threads, so read-modify-write
+        # sequences go through _stats_lock.
+        self._stats_lock = threading.Lock()
+        self._trivial_skips = 0
+        self._provider_calls = 0
+        self._mean_provider_ms = 0.0
+
+        # Provider clients (one per API key) are created on first use and
+        # reused afterwards, so consecutive analyses share pooled keep-alive
+        # connections
+        self._clients: List[Any] = []
+        self._clients_lock = threading.Lock()
+        self._client_turn = itertools.count()
+
         logger.info(f"AI Analyzer initialized with provider: {self.provider}")
 
     def analyze_query(
@@ -65,14 +220,144 @@ class AIAnalyzer:
         """
         if self.provider == "stub":
             return self._stub_analysis(sql, explain_plan, db_type)
-        elif self.provider == "openai":
-            return self._openai_analysis(sql, explain_plan, db_type)
+
+        if is_trivial_query(sql):
+            return self._trivial_analysis()
+
+        cache_key = make_cache_key(sql, db_type, settings.ai_model)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.debug("AI analysis cache hit for %s query", db_type)
+            return cached
+
+        with self._inflight_lock:
+            # The previous owner may have cached its result and left the
+            # in-flight map between the lookup above and this lock
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+            future = self._inflight.get(cache_key)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._inflight[cache_key] = future
+
+        if not is_owner:
+            logger.debug("Waiting for in-flight AI analysis of identical %s query", db_type)
+            return copy.deepcopy(future.result())
+
+        try:
+            start = time.perf_counter()
+            result = self._call_provider(
+                sql, explain_plan, db_type,
+                duration_ms=duration_ms,
+                rows_examined=rows_examined,
+                rows_returned=rows_returned
+            )
+            self._record_provider_call((time.perf_counter() - start) * 1000)
+
+            # Don't cache stub fallbacks, so a transient provider failure
+            # isn't replayed for every later occurrence of the query
+            if result.get('provider') == self.provider:
+                self.cache.set(cache_key, result)
+
+            future.set_result(copy.deepcopy(result))
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(cache_key, None)
+
+    def _call_provider(
+        self,
+        sql: str,
+        explain_plan: Optional[Dict[str, Any]],
+        db_type: str,
+        duration_ms: float = 0,
+        rows_examined: Optional[int] = None,
+        rows_returned: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Dispatch the analysis to the configured provider.
+
+        Args:
+            sql: SQL query text
+            explain_plan: Execution plan (if available)
+            db_type: Database type (mysql, postgres)
+            duration_ms: Query execution time in milliseconds
+            rows_examined: Number of rows examined
+            rows_returned: Number of rows returned
+
+        Returns:
+            Provider analysis results
+        """
+        if self.provider == "openai":
+            return self._openai_analysis(
+                sql, explain_plan, db_type,
+                duration_ms=duration_ms,
+                rows_examined=rows_examined,
+                rows_returned=rows_returned
+            )
         elif self.provider == "anthropic":
             return self._anthropic_analysis(sql, explain_plan, db_type)
         else:
             logger.error(f"Unknown AI provider: {self.provider}")
             return self._stub_analysis(sql, explain_plan, db_type)
 
+    def _trivial_analysis(self) -> Dict[str, Any]:
+        """
+        Result returned instead of calling the provider for trivial queries.
+
+        Carries no findings, so enhance_analysis() keeps the rule-based result.
+
+        Returns:
+            Empty analysis results
+        """
+        with self._stats_lock:
+            self._trivial_skips += 1
+        return {
+            'ai_insights': [],
+            'confidence': 0,
+            'provider': self.provider,
+            'model': f"{settings.ai_model}+trivial"
+        }
+
+    def _record_provider_call(self, elapsed_ms: float):
+        """
+        Record the latency of one provider call.
+
+        Args:
+            elapsed_ms: Wall time of the call in milliseconds
+        """
+        with self._stats_lock:
+            self._provider_calls += 1
+            self._mean_provider_ms += (elapsed_ms - self._mean_provider_ms) / self._provider_calls
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get analyzer statistics.
+
+        Returns:
+            Dictionary with provider, latency and cache counters
+        """
+        cache_stats = self.cache.get_stats()
+        with self._stats_lock:
+            trivial_skips = self._trivial_skips
+            provider_calls = self._provider_calls
+            mean_provider_ms = self._mean_provider_ms
+
+        return {
+            'provider': self.provider,
+            'trivial_skips': trivial_skips,
+            'provider_calls': provider_calls,
+            'avg_provider_time_ms': round(mean_provider_ms, 2),
+            'cache_size': cache_stats['size'],
+            'cache_hits': cache_stats['hits'],
+            'cache_misses': cache_stats['misses'],
+        }
+
     def _stub_analysis(
         self,
         sql: str,
@@ -90,7 +375,7 @@ class AIAnalyzer:
         Returns:
             Mock analysis results
         """
-        logger.debug(f"Using stub AI analysis for {db_type} query")
+        logger.debug("Using stub AI analysis for %s query", db_type)
 
         return {
             'ai_insights': [
@@ -121,7 +406,7 @@ class AIAnalyzer:
             'model': 'mock-v1'
         }
 
-    def _openai_analysis(
+    def _build_openai_messages(
         self,
         sql: str,
         explain_plan: Optional[Dict[str, Any]],
@@ -129,9 +414,9 @@ class AIAnalyzer:
         duration_ms: float = 0,
         rows_examined: Optional[int] = None,
         rows_returned: Optional[int] = None
-    ) -> Dict[str, Any]:
+    ) -> List[Dict[str, str]]:
         """
-        OpenAI GPT-4 analysis implementation.
+        Build the chat messages sent to OpenAI.
 
         Args:
             sql: SQL query
@@ -142,127 +427,132 @@ class AIAnalyzer:
             rows_returned: Rows returned
 
         Returns:
-            OpenAI analysis results
+            List of chat messages (system + user)
         """
-        try:
-            from openai import OpenAI
-            client = OpenAI(api_key=self.api_key)
+        # Calculate efficiency ratio
+        ratio = "N/A"
+        if rows_examined and rows_returned:
+            ratio = f"{rows_examined / max(rows_returned, 1):.1f}:1"
+
+        if explain_plan:
+            plan_bytes = orjson.dumps(explain_plan)
+            if len(plan_bytes) <= _COMPACT_PLAN_BYTES:
+                plan_bytes = orjson.dumps(explain_plan, option=orjson.OPT_INDENT_2)
+            plan = plan_bytes.decode()
+        else:
+            plan = "Not available"
 
-            # Calculate efficiency ratio
-            ratio = "N/A"
-            if rows_examined and rows_returned:
-                ratio = f"{rows_examined / max(rows_returned, 1):.1f}:1"
+        user_prompt = _USER_PROMPT_TEMPLATE.format(
+            db_type=db_type,
+            duration_ms=duration_ms,
+            rows_examined=_format_rows(rows_examined),
+            rows_returned=_format_rows(rows_returned),
+            ratio=ratio,
+            sql=sql,
+            plan=plan
+        )
 
-            # Build comprehensive prompt
-            system_prompt = """You are a senior database performance engineer with expertise in MySQL and PostgreSQL optimization.
-Analyze SQL queries and provide specific, actionable optimization recommendations.
+        return [
+            {"role": "system", "content": _system_prompt(db_type)},
+            {"role": "user", "content": user_prompt}
+        ]
 
-Response format (JSON):
-{
-  "root_cause": "Specific technical reason for slow performance",
-  "problem_summary": "Brief description of the issue",
-  "index_recommendations": [
-    {
-      "sql": "CREATE INDEX idx_name ON table(col1, col2)",
-      "rationale": "Why this index helps",
-      "impact": "Expected improvement"
-    }
-  ],
-  "query_optimizations": [
-    {
-      "type": "rewrite|structure|join",
-      "description": "What to change",
-      "example": "Improved query example if applicable"
-    }
-  ],
-  "improvement_level": "LOW|MEDIUM|HIGH|CRITICAL",
-  "estimated_speedup": "e.g., 10-50x",
-  "confidence": 0.85
-}"""
+    def _parse_openai_response(self, ai_response: str) -> Dict[str, Any]:
+        """
+        Convert an OpenAI completion into our analysis format.
 
-            user_prompt = f"""Analyze this slow query:
+        Args:
+            ai_response: Raw message content returned by the model
 
-DATABASE: {db_type}
-DURATION: {duration_ms}ms
-ROWS EXAMINED: {rows_examined:,}
-ROWS RETURNED: {rows_returned:,}
-EFFICIENCY RATIO: {ratio}
+        Returns:
+            OpenAI analysis results
+        """
+        logger.debug("OpenAI response: %s", ai_response)
 
-SQL QUERY:
-```sql
-{sql}
-```
+        # Try to parse as JSON
+        try:
+            parsed = orjson.loads(_strip_code_fence(ai_response))
+        except orjson.JSONDecodeError:
+            # If not valid JSON, extract key information from text
+            logger.warning("Could not parse OpenAI response as JSON, using text extraction")
+            return {
+                'ai_insights': [ai_response[:500]],
+                'optimization_strategy': 'See AI insights for details',
+                'confidence': 0.75,
+                'provider': 'openai',
+                'model': settings.ai_model
+            }
+
+        # Convert to our format
+        suggestions = []
+
+        # Add index recommendations
+        for idx_rec in parsed.get('index_recommendations', []):
+            suggestions.append({
+                'type': 'INDEX',
+                'priority': 'HIGH',
+                'description': idx_rec.get('rationale', ''),
+                'sql': idx_rec.get('sql', ''),
+                'estimated_impact': idx_rec.get('impact', '')
+            })
+
+        # Add query optimizations
+        for opt in parsed.get('query_optimizations', []):
+            suggestions.append({
+                'type': 'OPTIMIZATION',
+                'priority': 'MEDIUM',
+                'description': opt.get('description', ''),
+                'sql': opt.get('example', ''),
+                'estimated_impact': 'Varies'
+            })
 
-EXECUTION PLAN:
-```json
-{json.dumps(explain_plan, indent=2) if explain_plan else "Not available"}
-```
+        return {
+            'root_cause': parsed.get('root_cause', ''),
+            'problem': parsed.get('problem_summary', ''),
+            'suggestions': suggestions,
+            'improvement_level': parsed.get('improvement_level', 'MEDIUM'),
+            'estimated_speedup': parsed.get('estimated_speedup', '2-5x'),
+            'confidence': parsed.get('confidence', 0.85),
+            'method': 'ai_assisted',
+            'provider': 'openai',
+            'model': settings.ai_model
+        }
 
-Provide specific recommendations with exact column names for indexes."""
+    def _openai_analysis(
+        self,
+        sql: str,
+        explain_plan: Optional[Dict[str, Any]],
+        db_type: str,
+        duration_ms: float = 0,
+        rows_examined: Optional[int] = None,
+        rows_returned: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        OpenAI GPT-4 analysis implementation.
+
+        Args:
+            sql: SQL query
+            explain_plan: Execution plan
+            db_type: Database type
+            duration_ms: Query execution time
+            rows_examined: Rows scanned
+            rows_returned: Rows returned
 
-            response = client.chat.completions.create(
-                model="gpt-4",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
+        Returns:
+            OpenAI analysis results
+        """
+        try:
+            response = self._get_openai_client().chat.completions.create(
+                model=settings.ai_model,
+                messages=self._build_openai_messages(
+                    sql, explain_plan, db_type,
+                    duration_ms, rows_examined, rows_returned
+                ),
                 temperature=0.3,
                 max_tokens=2000
             )
 
-            # Parse AI response
-            ai_response = response.choices[0].message.content
-            logger.debug(f"OpenAI response: {ai_response}")
-
-            # Try to parse as JSON
-            try:
-                import json as json_module
-                parsed = json_module.loads(ai_response)
-
-                # Convert to our format
-                suggestions = []
-
-                # Add index recommendations
-                for idx_rec in parsed.get('index_recommendations', []):
-                    suggestions.append({
-                        'type': 'INDEX',
-                        'priority': 'HIGH',
-                        'description': idx_rec.get('rationale', ''),
-                        'sql': idx_rec.get('sql', ''),
-                        'estimated_impact': idx_rec.get('impact', '')
-                    })
-
-                # Add query optimizations
-                for opt in parsed.get('query_optimizations', []):
-                    suggestions.append({
-                        'type': 'OPTIMIZATION',
-                        'priority': 'MEDIUM',
-                        'description': opt.get('description', ''),
-                        'sql': opt.get('example', ''),
-                        'estimated_impact': 'Varies'
-                    })
-
-                return {
-                    'root_cause': parsed.get('root_cause', ''),
-                    'problem': parsed.get('problem_summary', ''),
-                    'suggestions': suggestions,
-                    'improvement_level': parsed.get('improvement_level', 'MEDIUM'),
-                    'estimated_speedup': parsed.get('estimated_speedup', '2-5x'),
-                    'confidence': parsed.get('confidence', 0.85),
-                    'method': 'ai_assisted',
-                    'provider': 'openai',
-                    'model': 'gpt-4'
-                }
-            except json_module.JSONDecodeError:
-                # If not valid JSON, extract key information from text
-                logger.warning("Could not parse OpenAI response as JSON, using text extraction")
-                return {
-                    'ai_insights': [ai_response[:500]],
-                    'optimization_strategy': 'See AI insights for details',
-                    'confidence': 0.75,
-                    'provider': 'openai',
-                    'model': 'gpt-4'
-                }
+            return self._parse_openai_response(response.choices[0].message.content)
 
         except ImportError:
             logger.error("openai package not installed. Run: pip install openai")
@@ -271,6 +561,45 @@ Provide specific recommendations with exact column names for indexes."""
             logger.error(f"OpenAI analysis failed: {e}")
             return self._stub_analysis(sql, explain_plan, db_type)
 
+    def _get_openai_client(self):
+        """
+        Get the next shared OpenAI client, creating the clients on first use.
+
+        With several API keys, successive calls rotate through one client
+        per key.
+
+        Returns:
+            openai.OpenAI client instance
+        """
+        if not self._clients:
+            with self._clients_lock:
+                if not self._clients:
+                    import httpx
+                    from openai import OpenAI
+                    http_client = httpx.Client(
+                        limits=httpx.Limits(
+                            max_connections=_HTTP_MAX_CONNECTIONS,
+                            max_keepalive_connections=_HTTP_MAX_KEEPALIVE
+                        ),
+                    )
+                    self._clients = [
+                        OpenAI(
+                            api_key=key,
+                            max_retries=3,  # SDK retries 408/409/429/5xx with backoff
+                            http_client=http_client,
+                        )
+                        for key in self.api_keys
+                    ]
+        return self._clients[next(self._client_turn) % len(self._clients)]
+
+    def close(self):
+        """Close provider HTTP clients and release pooled connections."""
+        with self._clients_lock:
+            clients, self._clients = self._clients, []
+        if clients:
+            # All clients share one HTTP pool
+            clients[0].close()
+
     def _anthropic_analysis(
         self,
         sql: str,
@@ -389,6 +718,20 @@ Provide specific recommendations with exact column names for indexes."""
         return enhanced
 
 
+# Global analyzer instance (shared so the response cache outlives a single analysis)
+_ai_analyzer: Optional[AIAnalyzer] = None
+_ai_analyzer_lock = threading.Lock()
+
+
+def close_ai_analyzer():
+    """Close the shared analyzer's provider connections, if it was created."""
+    global _ai_analyzer
+    with _ai_analyzer_lock:
+        analyzer, _ai_analyzer = _ai_analyzer, None
+    if analyzer is not None:
+        analyzer.close()
+
+
 # Factory function
 def get_ai_analyzer() -> AIAnalyzer:
     """
@@ -397,10 +740,16 @@ def get_ai_analyzer() -> AIAnalyzer:
     Returns:
         Configured AIAnalyzer instance
     """
-    provider = getattr(settings, 'ai_provider', 'stub')
-    api_key = getattr(settings, 'ai_api_key', None)
-
-    return AIAnalyzer(provider=provider, api_key=api_key)
+    global _ai_analyzer
+    if _ai_analyzer is None:
+        # Analyzer worker threads may get here together on first use; only
+        # one of them may build the instance, or the cache would be split
+        with _ai_analyzer_lock:
+            if _ai_analyzer is None:
+                provider = getattr(settings, 'ai_provider', 'stub')
+                api_key = getattr(settings, 'ai_api_key', None)
+                _ai_analyzer = AIAnalyzer(provider=provider, api_key=api_key)
+    return _ai_analyzer
 
 
 # Example usage
@@ -6,8 +6,10 @@ to generate optimization suggestions.
 """
 import json
 import binascii
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from enum import IntEnum
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from decimal import Decimal
 
 from backend.core.config import settings
@@ -19,6 +21,54 @@ from backend.services.fingerprint import extract_tables_from_query
 logger = get_logger(__name__)
 
 
+class ImprovementLevel(IntEnum):
+    """Improvement levels ordered by impact, so levels compare natively."""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
+
+
+def escalate_level(current: str, minimum: str) -> str:
+    """
+    Raise an improvement level to at least the given minimum.
+
+    Args:
+        current: Current level name (LOW, MEDIUM, HIGH, CRITICAL)
+        minimum: Lowest acceptable level name
+
+    Returns:
+        Name of the higher of the two levels
+    """
+    level = ImprovementLevel.__members__.get(current, ImprovementLevel.LOW)
+    return max(level, ImprovementLevel[minimum]).name
+
+
+def _plan_uses_filesort(node: Any) -> bool:
+    """
+    Check whether a MySQL EXPLAIN FORMAT=JSON plan sorts with a filesort.
+
+    Walks the plan for a true "using_filesort" flag, which MySQL sets on
+    ordering_operation/grouping_operation blocks at any nesting depth.
+
+    Args:
+        node: Plan (or part of a plan) to search
+
+    Returns:
+        True if any block in the plan uses a filesort
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if node.get('using_filesort'):
+                return True
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return False
+
+
 def decode_hex_sql(sql: str) -> str:
     """
     Decode hex-encoded SQL string if needed.
@@ -40,7 +90,7 @@ def decode_hex_sql(sql: str) -> str:
             decoded_bytes = binascii.unhexlify(hex_string)
             return decoded_bytes.decode('utf-8')
         except Exception as e:
-            logger.warning(f"Failed to decode hex SQL: {e}")
+            logger.warning("Failed to decode hex SQL: %s", e)
             return sql  # Return original if decoding fails
 
     return sql
@@ -77,12 +127,12 @@ class QueryAnalyzer:
             ).first()
 
             if not query:
-                logger.error(f"Query not found: {query_id}")
+                logger.error("Query not found: %s", query_id)
                 return None
 
             # Check if already analyzed
             if query.analysis:
-                logger.info(f"Query {query_id} already has analysis, skipping")
+                logger.info("Query %s already has analysis, skipping", query_id)
                 return str(query.analysis.id)
 
             try:
@@ -112,11 +162,11 @@ class QueryAnalyzer:
                 db.commit()
                 db.refresh(analysis)
 
-                logger.info(f"✓ Analysis complete for query {query_id}: {analysis_data['improvement_level']}")
+                logger.info("✓ Analysis complete for query %s: %s", query_id, analysis_data['improvement_level'])
                 return str(analysis.id)
 
             except Exception as e:
-                logger.error(f"Analysis failed for query {query_id}: {e}", exc_info=True)
+                logger.error("Analysis failed for query %s: %s", query_id, e, exc_info=True)
                 query.status = 'ERROR'
                 db.commit()
                 return None
@@ -176,9 +226,9 @@ class QueryAnalyzer:
                     rows_examined=query.rows_examined,
                     rows_returned=query.rows_returned
                 )
-                logger.info(f"Enhanced analysis with AI ({settings.ai_provider})")
+                logger.info("Enhanced analysis with AI (%s)", settings.ai_provider)
             except Exception as e:
-                logger.warning(f"AI analysis failed, using rule-based only: {e}")
+                logger.warning("AI analysis failed, using rule-based only: %s", e)
 
         return result
 
@@ -248,7 +298,7 @@ class QueryAnalyzer:
                 })
 
             # Check for filesort
-            if 'filesort' in str(query_block).lower():
+            if _plan_uses_filesort(query_block):
                 result['suggestions'].append({
                     'type': 'INDEX',
                     'priority': 'MEDIUM',
@@ -256,8 +306,7 @@ class QueryAnalyzer:
                     'sql': '-- Add index on ORDER BY columns',
                     'estimated_impact': '2-5x improvement'
                 })
-                if result['improvement_level'] == 'LOW':
-                    result['improvement_level'] = 'MEDIUM'
+                result['improvement_level'] = escalate_level(result['improvement_level'], 'MEDIUM')
 
             # Check rows examined
             rows = table_info.get('rows_examined_per_scan', 0)
@@ -268,11 +317,10 @@ class QueryAnalyzer:
                     f"Query examines {rows:,} rows. "
                     "This indicates missing or ineffective indexes."
                 )
-                if result['improvement_level'] == 'LOW':
-                    result['improvement_level'] = 'MEDIUM'
+                result['improvement_level'] = escalate_level(result['improvement_level'], 'MEDIUM')
 
         except Exception as e:
-            logger.warning(f"Error analyzing MySQL plan: {e}")
+            logger.warning("Error analyzing MySQL plan: %s", e)
 
         return result
 
@@ -325,8 +373,7 @@ class QueryAnalyzer:
                     f"Query has high execution cost estimate ({total_cost:.2f}). "
                     "This usually indicates inefficient query structure or missing indexes."
                 )
-                if result['improvement_level'] == 'LOW':
-                    result['improvement_level'] = 'MEDIUM'
+                result['improvement_level'] = escalate_level(result['improvement_level'], 'MEDIUM')
 
                 result['suggestions'].append({
                     'type': 'OPTIMIZATION',
@@ -337,7 +384,7 @@ class QueryAnalyzer:
                 })
 
         except Exception as e:
-            logger.warning(f"Error analyzing PostgreSQL plan: {e}")
+            logger.warning("Error analyzing PostgreSQL plan: %s", e)
 
         return result
 
@@ -395,8 +442,7 @@ class QueryAnalyzer:
 
         # Check duration
         if query.duration_ms > 5000:  # > 5 seconds
-            if result['improvement_level'] == 'LOW':
-                result['improvement_level'] = 'MEDIUM'
+            result['improvement_level'] = escalate_level(result['improvement_level'], 'MEDIUM')
 
             result['suggestions'].append({
                 'type': 'REVIEW',
@@ -437,29 +483,71 @@ class QueryAnalyzer:
         Returns:
             Number of queries analyzed
         """
+        results = list(self.iter_analyze_pending(limit=limit))
+        if not results:
+            return 0
+
+        analyzed_count = sum(1 for _, result_id in results if result_id)
+
+        logger.info("✓ Analyzed %d of %d pending queries", analyzed_count, len(results))
+        return analyzed_count
+
+    def iter_analyze_pending(self, limit: int = 50) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Analyze queries with status 'NEW', yielding each result as it completes.
+
+        Args:
+            limit: Maximum number of queries to analyze in one batch
+
+        Yields:
+            Tuples of (query ID, analysis result ID or None on failure),
+            in completion order
+        """
         with get_db_context() as db:
-            # Fetch pending queries
-            pending_queries = db.query(SlowQueryRaw).filter(
-                SlowQueryRaw.status == 'NEW'
-            ).limit(limit).all()
-
-            if not pending_queries:
-                logger.info("No pending queries to analyze")
-                return 0
-
-            analyzed_count = 0
-
-            for query in pending_queries:
-                try:
-                    result_id = self.analyze_query(str(query.id))
-                    if result_id:
-                        analyzed_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to analyze query {query.id}: {e}")
-                    continue
-
-            logger.info(f"✓ Analyzed {analyzed_count} of {len(pending_queries)} pending queries")
-            return analyzed_count
+            # Fetch pending query IDs; each analysis opens its own session
+            pending_ids = [
+                str(row.id) for row in db.query(SlowQueryRaw.id).filter(
+                    SlowQueryRaw.status == 'NEW'
+                ).limit(limit).all()
+            ]
+
+        if not pending_ids:
+            logger.info("No pending queries to analyze")
+            return
+
+        # Analyses are dominated by AI provider round-trips, so run several
+        # at once instead of waiting on each call in turn
+        workers = max(1, min(settings.analyzer_concurrency, len(pending_ids)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analyzer')
+        try:
+            futures = {
+                executor.submit(self._analyze_pending, query_id): query_id
+                for query_id in pending_ids
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            # If the consumer stops early (e.g. a streaming client
+            # disconnects), don't block on the remaining analyses: drop the
+            # ones not started yet, so those queries stay NEW, and let the
+            # running ones finish in the background
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _analyze_pending(self, query_id: str) -> Optional[str]:
+        """
+        Analyze one pending query, logging instead of raising on failure.
+
+        Args:
+            query_id: UUID of the slow query to analyze
+
+        Returns:
+            Analysis result ID if successful, None otherwise
+        """
+        try:
+            return self.analyze_query(query_id)
+        except Exception as e:
+            logger.error("Failed to analyze query %s: %s", query_id, e)
+            return None
 
 
 # Example usage
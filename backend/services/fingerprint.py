@@ -12,6 +12,45 @@ from backend.core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Patterns are compiled once at import; normalize_query() runs for every
+# collected query, so avoid the per-call lookup in re's pattern cache.
+_WHITESPACE_RE = re.compile(r'\s+')
+_SINGLE_QUOTED_RE = re.compile(r"'(?:[^'\\]|\\.)*'")
+_DOUBLE_QUOTED_RE = re.compile(r'"(?:[^"\\\\]|\\\\.)*"')
+_NUMBER_RE = re.compile(r'\b-?\d+\.?\d*\b')
+_HEX_RE = re.compile(r'\b0x[0-9a-fA-F]+\b')
+_IN_LIST_RE = re.compile(r'\(\s*\?\s*(?:,\s*\?\s*)+\)')
+_LIMIT_RE = re.compile(r'\bLIMIT\s+\?(?:\s+OFFSET\s+\?)?', re.IGNORECASE)
+_OFFSET_RE = re.compile(r'\bOFFSET\s+\?', re.IGNORECASE)
+
+# FROM and JOIN clauses, matched in a single scan of the query
+_TABLE_RE = re.compile(r'\b(?:from|join)\s+([a-zA-Z_][a-zA-Z0-9_]*)', re.IGNORECASE)
+
+# Leading statement keyword recognised by classify_query_type()
+_QUERY_TYPE_RE = re.compile(
+    r'\s*(SELECT|INSERT|UPDATE|DELETE|CREATE|ALTER|DROP)', re.IGNORECASE
+)
+
+# Statements with nothing to optimize: session/introspection commands, and
+# SELECTs whose items are all literals, system variables or cheap built-ins
+# (SELECT 1, SELECT NOW(), health-check pings). The SELECT rule is applied to
+# the normalized query, where literals are already "?". Any other function
+# call, e.g. SELECT pg_sleep(10) or SELECT BENCHMARK(...), is not trivial.
+_TRIVIAL_COMMAND_RE = re.compile(
+    r'^\s*(?:show|set|explain|describe|desc|use)\b', re.IGNORECASE
+)
+_TRIVIAL_SELECT_ITEM = (
+    r'(?:-?\?|null|true|false|@@[\w.]+'
+    r'|(?:now|version|current_timestamp|current_date|current_time|current_user'
+    r'|localtime|localtimestamp|utc_timestamp|user|database|schema'
+    r'|connection_id|pg_backend_pid)(?:\s*\(\s*\))?)'
+    r'(?:\s+(?:as\s+)?(?:\w+|\?))?'
+)
+_TRIVIAL_SELECT_RE = re.compile(
+    rf'^select\s+{_TRIVIAL_SELECT_ITEM}(?:\s*,\s*{_TRIVIAL_SELECT_ITEM})*\s*$',
+    re.IGNORECASE
+)
+
 
 def normalize_query(sql: str) -> str:
     """
@@ -41,30 +80,30 @@ def normalize_query(sql: str) -> str:
         return ""
 
     # Remove extra whitespace and normalize spacing
-    normalized = re.sub(r'\s+', ' ', sql.strip())
+    normalized = _WHITESPACE_RE.sub(' ', sql.strip())
 
     # Replace string literals (single quotes)
     # Matches: 'string', 'string with spaces', 'string\'s with escapes'
-    normalized = re.sub(r"'(?:[^'\\]|\\.)*'", "?", normalized)
+    normalized = _SINGLE_QUOTED_RE.sub("?", normalized)
 
     # Replace string literals (double quotes)
-    normalized = re.sub(r'"(?:[^"\\\\]|\\\\.)*"', "?", normalized)
+    normalized = _DOUBLE_QUOTED_RE.sub("?", normalized)
 
     # Replace numbers (integers and decimals)
     # Matches: 123, 123.45, -123, -123.45
-    normalized = re.sub(r'\b-?\d+\.?\d*\b', '?', normalized)
+    normalized = _NUMBER_RE.sub('?', normalized)
 
     # Replace hex values (0x...)
-    normalized = re.sub(r'\b0x[0-9a-fA-F]+\b', '?', normalized)
+    normalized = _HEX_RE.sub('?', normalized)
 
     # Normalize multiple consecutive placeholders
     # "WHERE x = ? AND y = ?" stays as is
     # "WHERE x IN (?, ?, ?)" -> "WHERE x IN (?)"
-    normalized = re.sub(r'\(\s*\?\s*(?:,\s*\?\s*)+\)', '(?)', normalized)
+    normalized = _IN_LIST_RE.sub('(?)', normalized)
 
     # Normalize LIMIT/OFFSET values
-    normalized = re.sub(r'\bLIMIT\s+\?(?:\s+OFFSET\s+\?)?', 'LIMIT ?', normalized, flags=re.IGNORECASE)
-    normalized = re.sub(r'\bOFFSET\s+\?', 'OFFSET ?', normalized, flags=re.IGNORECASE)
+    normalized = _LIMIT_RE.sub('LIMIT ?', normalized)
+    normalized = _OFFSET_RE.sub('OFFSET ?', normalized)
 
     # Remove trailing semicolon if present
     normalized = normalized.rstrip(';')
@@ -128,31 +167,10 @@ def extract_tables_from_query(sql: str) -> list[str]:
     Returns:
         List of table names found in the query
     """
-    tables = []
-
-    # Normalize query
-    sql_lower = sql.lower()
-
-    # Pattern to match FROM and JOIN clauses
-    # Simplified: looks for FROM/JOIN followed by word characters
-    patterns = [
-        r'\bfrom\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-        r'\bjoin\s+([a-zA-Z_][a-zA-Z0-9_]*)',
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, sql_lower)
-        tables.extend(matches)
-
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_tables = []
-    for table in tables:
-        if table not in seen:
-            seen.add(table)
-            unique_tables.append(table)
-
-    return unique_tables
+    # Single pass over the query; names are lowercased and de-duplicated
+    # while preserving the order they appear in
+    tables = (match.group(1).lower() for match in _TABLE_RE.finditer(sql))
+    return list(dict.fromkeys(tables))
 
 
 def classify_query_type(sql: str) -> str:
@@ -169,24 +187,35 @@ def classify_query_type(sql: str) -> str:
     if isinstance(sql, bytes):
         sql = sql.decode('utf-8', errors='replace')
 
-    sql_upper = sql.strip().upper()
-
-    if sql_upper.startswith('SELECT'):
-        return 'SELECT'
-    elif sql_upper.startswith('INSERT'):
-        return 'INSERT'
-    elif sql_upper.startswith('UPDATE'):
-        return 'UPDATE'
-    elif sql_upper.startswith('DELETE'):
-        return 'DELETE'
-    elif sql_upper.startswith('CREATE'):
-        return 'CREATE'
-    elif sql_upper.startswith('ALTER'):
-        return 'ALTER'
-    elif sql_upper.startswith('DROP'):
-        return 'DROP'
-    else:
-        return 'OTHER'
+    # Match the keyword in place instead of upper-casing the whole
+    # statement; queries can be many kilobytes long
+    match = _QUERY_TYPE_RE.match(sql)
+    return match.group(1).upper() if match else 'OTHER'
+
+
+def is_trivial_query(sql: str) -> bool:
+    """
+    Check if a query is too simple to be worth an AI analysis.
+
+    Matches empty statements, SHOW/SET/EXPLAIN/DESCRIBE/USE, and SELECTs
+    of only literals and cheap built-ins (e.g. "SELECT 1", "SELECT NOW()").
+
+    Args:
+        sql: SQL query string
+
+    Returns:
+        True if the query is trivial, False otherwise
+    """
+    if isinstance(sql, bytes):
+        sql = sql.decode('utf-8', errors='replace')
+
+    if not sql or not sql.strip():
+        return True
+
+    if _TRIVIAL_COMMAND_RE.match(sql):
+        return True
+
+    return _TRIVIAL_SELECT_RE.match(normalize_query(sql)) is not None
 
 
 def is_query_safe_to_explain(sql: str) -> bool:
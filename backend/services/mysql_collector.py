@@ -3,12 +3,13 @@ MySQL slow query collector.
 
 Collects slow queries from MySQL's slow_log table and generates EXPLAIN plans.
 """
-import json
+import hashlib
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from decimal import Decimal
 
 import mysql.connector
+import orjson
 from mysql.connector import Error as MySQLError
 
 from backend.core.config import settings
@@ -32,6 +33,10 @@ class MySQLCollector:
         """Initialize MySQL collector with configuration."""
         self.config = settings.mysql_lab
         self.connection = None
+        # EXPLAIN results for the current collection run, keyed by SQL digest.
+        # slow_log holds one row per execution, so the same statement text
+        # usually shows up many times in a single batch.
+        self._explain_cache: Dict[bytes, Optional[Dict[str, Any]]] = {}
 
     def connect(self) -> bool:
         """
@@ -114,16 +119,30 @@ class MySQLCollector:
             logger.error(f"Error fetching slow queries: {e}")
             return []
 
-    def generate_explain(self, sql: str) -> Optional[Dict[str, Any]]:
+    def generate_explain(self, sql: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """
         Generate EXPLAIN plan for a SQL query.
 
         Args:
             sql: SQL query to explain
+            use_cache: Reuse the plan (or failure) from an identical statement
+                seen earlier in this collection run
 
         Returns:
             EXPLAIN plan as JSON dict, or None if failed
         """
+        if not use_cache:
+            return self._run_explain(sql)
+
+        # slow_log.sql_text may come back as bytes
+        data = sql if isinstance(sql, bytes) else sql.encode('utf-8')
+        key = hashlib.blake2b(data, digest_size=16).digest()
+        if key not in self._explain_cache:
+            self._explain_cache[key] = self._run_explain(sql)
+        return self._explain_cache[key]
+
+    def _run_explain(self, sql: str) -> Optional[Dict[str, Any]]:
+        """Run EXPLAIN FORMAT=JSON against the lab database."""
         if not is_query_safe_to_explain(sql):
             logger.warning(f"Skipping EXPLAIN for non-SELECT query: {sql[:50]}...")
             return None
@@ -143,8 +162,8 @@ class MySQLCollector:
             cursor.close()
 
             if result and result[0]:
-                # Parse JSON string
-                plan = json.loads(result[0])
+                # Parse JSON string (plans for multi-join queries can be large)
+                plan = orjson.loads(result[0])
                 return plan
 
             return None
@@ -152,7 +171,7 @@ class MySQLCollector:
         except MySQLError as e:
             logger.warning(f"EXPLAIN failed for query: {e}")
             return None
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             logger.error(f"Failed to parse EXPLAIN JSON: {e}")
             return None
 
@@ -169,6 +188,9 @@ class MySQLCollector:
         if not self.connect():
             return 0
 
+        # Plans can change between runs (new indexes, table growth)
+        self._explain_cache.clear()
+
         try:
             # Fetch slow queries
             slow_queries = self.fetch_slow_queries(since=since)
@@ -192,15 +214,16 @@ class MySQLCollector:
                         fingerprint, sql_hash = fingerprint_query(sql_text)
 
                         # Check if we already have this exact query execution
-                        existing = db.query(SlowQueryRaw).filter(
+                        # Only the ID is selected; no need to load the whole row
+                        exists = db.query(SlowQueryRaw.id).filter(
                             SlowQueryRaw.source_db_type == 'mysql',
                             SlowQueryRaw.source_db_host == self.config.host,
                             SlowQueryRaw.sql_hash == sql_hash,
                             SlowQueryRaw.captured_at == query_record['start_time']
-                        ).first()
+                        ).first() is not None
 
-                        if existing:
-                            logger.debug(f"Query already exists, skipping: {sql_hash}")
+                        if exists:
+                            logger.debug("Query already exists, skipping: %s", sql_hash)
                             continue
 
                         # Generate EXPLAIN plan
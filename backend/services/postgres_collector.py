@@ -211,14 +211,15 @@ class PostgreSQLCollector:
 
                         # Check if we already have this query pattern recently
                         # Note: pg_stat_statements aggregates executions, so we check by fingerprint
-                        existing = db.query(SlowQueryRaw).filter(
+                        # Only the ID is selected; no need to load the whole row
+                        exists = db.query(SlowQueryRaw.id).filter(
                             SlowQueryRaw.source_db_type == 'postgres',
                             SlowQueryRaw.source_db_host == self.config.host,
                             SlowQueryRaw.fingerprint == fingerprint
-                        ).first()
+                        ).first() is not None
 
-                        if existing:
-                            logger.debug(f"Query pattern already exists, skipping: {sql_hash}")
+                        if exists:
+                            logger.debug("Query pattern already exists, skipping: %s", sql_hash)
                             continue
 
                         # Generate EXPLAIN plan